@@ -1267,13 +1267,25 @@ class Hypergraph:
         For every (hyper)edge e in the hypergraph and node n in e there is an edge (n,e)
         in the graph.
 
+        If the hypergraph is static the graph is computed once and stored in
+        the state dictionary, and each call returns a copy of it.
+
         """
+        if self.isstatic:
+            B = self.state_dict.get("bipartite", None)
+            if B is not None:
+                return B.copy()
+
         B = nx.Graph()
         E = self.edges
         V = self.nodes
         B.add_nodes_from(E, bipartite=1)
         B.add_nodes_from(V, bipartite=0)
         B.add_edges_from([(v, e) for e in E for v in self.edges[e]])
+
+        if self.isstatic:
+            self.set_state(bipartite=B)
+            return B.copy()
         return B
 
     def dual(self, name=None):
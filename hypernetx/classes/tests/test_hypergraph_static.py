@@ -46,3 +46,15 @@ def test_static_hypergraph_get_linegraph(lesmis):
 def test_static_hypergraph_s_connected_components(lesmis):
     H = Hypergraph(lesmis.edgedict, static=True)
     assert {7, 8} in list(H.s_connected_components(edges=True, s=4))
+
+
+def test_static_hypergraph_bipartite(seven_by_six):
+    sbs = seven_by_six
+    H = Hypergraph(sbs.edgedict, static=True)
+    B = H.bipartite()
+    assert nx.is_bipartite(B)
+    assert set(B.nodes) == set(H.nodes) | set(H.edges)
+    # the cached graph is not shared with callers
+    B.remove_nodes_from(list(H.edges))
+    assert set(H.bipartite().nodes) == set(H.nodes) | set(H.edges)
+    assert H.bipartite() is not H.bipartite()
@@ -10,7 +10,12 @@ from .util import (
 )
 
 import matplotlib.pyplot as plt
-from matplotlib.collections import PolyCollection, LineCollection, CircleCollection
+from matplotlib.collections import (
+    PolyCollection,
+    LineCollection,
+    CircleCollection,
+    EllipseCollection,
+)
 
 import networkx as nx
 
@@ -253,26 +258,42 @@ def draw_hyper_nodes(H, pos, node_radius={}, r0=None, ax=None, **kwargs):
     ax: Axis
         matplotlib axis on which the plot is rendered
     kwargs: dict
-        keyword arguments, e.g., linewidth, facecolors, are passed through to the PolyCollection constructor
+        keyword arguments, e.g., linewidth, facecolors, are passed through to the EllipseCollection constructor
 
     Returns
     -------
-    PolyCollection
-        a Matplotlib PolyCollection that can be further styled
+    EllipseCollection
+        a Matplotlib EllipseCollection that can be further styled
     """
 
     ax = ax or plt.gca()
 
     r0 = r0 or get_default_radius(H, pos)
 
-    points = [node_radius.get(v, r0) * cp + pos[v] for v in H.nodes]
+    # a single collection parameterized by node centers and diameters is much
+    # cheaper than building one polygon per node
+    offsets = np.array([pos[v] for v in H.nodes], dtype=float).reshape(-1, 2)
+    diameters = 2 * np.array([node_radius.get(v, r0) for v in H.nodes], dtype=float)
 
     kwargs.setdefault("facecolors", "black")
 
-    circles = PolyCollection(points, **inflate_kwargs(H, kwargs))
+    circles = EllipseCollection(
+        widths=diameters,
+        heights=diameters,
+        angles=0,
+        units="xy",
+        offsets=offsets,
+        offset_transform=ax.transData,
+        **inflate_kwargs(H, kwargs)
+    )
 
     ax.add_collection(circles)
 
+    # the collection only reports its offsets to the data limits, so extend
+    # them to cover each circle as the individual patches used to
+    radii = diameters[:, None] / 2
+    ax.update_datalim(np.vstack([offsets - radii, offsets + radii]))
+
     return circles
 
 
@@ -411,7 +432,7 @@ def draw(
     node_radius: None, int, float, or dict
         radius of all nodes, or dictionary of node:value; the default (None) calculates radius based on number of collapsed nodes; reasonable values range between 1 and 3
     nodes_kwargs: dict
-        keyword arguments passed to matplotlib.collections.PolyCollection for nodes
+        keyword arguments passed to matplotlib.collections.EllipseCollection for nodes
     edge_labels_kwargs: dict
         keyword arguments passed to matplotlib.annotate for edge labels
     node_labels_kwargs: dict
@@ -430,7 +451,7 @@ def draw(
         pos = layout_node_link(H, layout=layout, **layout_kwargs)
 
     r0 = get_default_radius(H, pos)
-    a0 = np.pi * r0 ** 2
+    a0 = np.pi * r0**2
 
     def get_node_radius(v):
         if node_radius is None:
@@ -0,0 +1,15 @@
+import pytest
+import hypernetx as hnx
+
+
+class TwoComponents:
+    """Example hypergraph with a connected component of 4 nodes and 2 edges and an isolated edge"""
+
+    def __init__(self):
+        self.edgedict = {"A": ["a", "b", "c"], "B": ["b", "d"], "C": ["e"]}
+        self.hypergraph = hnx.Hypergraph(self.edgedict, name="TwoComponents")
+
+
+@pytest.fixture
+def twocomponents():
+    return TwoComponents()
@@ -0,0 +1,20 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from hypernetx.drawing.rubber_band import draw_hyper_nodes
+
+
+def test_draw_hyper_nodes(twocomponents):
+    H = twocomponents.hypergraph
+    pos = {v: (i, i % 2) for i, v in enumerate("abcde")}
+    node_radius = {"b": 0.5, "e": 1}
+    fig, ax = plt.subplots()
+    circles = draw_hyper_nodes(H, pos, node_radius=node_radius, r0=0.2, ax=ax)
+    nodes = list(H.nodes)
+    assert np.allclose(circles.get_offsets(), [pos[v] for v in nodes])
+    radii = np.array([node_radius.get(v, 0.2) for v in nodes])
+    # EllipseCollection stores half widths and heights
+    assert np.allclose(circles._widths, radii)
+    assert np.allclose(circles._heights, radii)
+    # the data limits cover every circle, not just the centers
+    assert np.allclose(ax.dataLim.get_points(), [[-0.2, -1], [5, 1.5]])
+    plt.close(fig)
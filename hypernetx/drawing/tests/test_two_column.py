@@ -0,0 +1,159 @@
+import pytest
+import warnings
+import numpy as np
+import networkx as nx
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+import hypernetx as hnx
+import hypernetx.drawing.two_column as two_column
+from hypernetx.drawing.two_column import (
+    draw,
+    draw_hyper_edges,
+    draw_hyper_labels,
+    fiedler_ordering,
+    get_position_array,
+    layout_two_column,
+    layout_two_column_array,
+)
+
+warnings.simplefilter("ignore")
+
+
+@pytest.mark.parametrize("lobpcg", [False, True])
+@pytest.mark.parametrize(
+    "G",
+    [
+        nx.path_graph(10),
+        nx.path_graph(1000),
+        nx.connected_watts_strogatz_graph(300, 4, 0.1, seed=1),
+    ],
+)
+def test_fiedler_ordering(G, lobpcg, monkeypatch):
+    if lobpcg:
+        monkeypatch.setattr(two_column, "LOBPCG_THRESHOLD", 0)
+    A = nx.to_scipy_sparse_array(G, nodelist=list(G))
+    ordering = list(fiedler_ordering(A))
+    expected = nx.spectral_ordering(G, seed=1)
+    # the sign of the Fiedler vector is arbitrary
+    assert ordering == expected or ordering == expected[::-1]
+
+
+@pytest.mark.parametrize("ordering", ["spectral", "rcm"])
+def test_layout_two_column(twocomponents, ordering):
+    H = twocomponents.hypergraph
+    pos = layout_two_column(H, ordering=ordering)
+    assert set(pos) == set("abcde") | set("ABC")
+    assert {pos[v][0] for v in "abcde"} == {0}
+    assert {pos[e][0] for e in "ABC"} == {1}
+    # the isolated edge is stacked after the first component
+    assert pos["C"][1] > max(pos[v][1] for v in "abcd")
+    assert len(set(pos.values())) == len(pos)
+
+
+def test_layout_two_column_star():
+    H = hnx.Hypergraph({"A": ["a", "b", "c", "d", "e"]})
+    pos = layout_two_column(H)
+    assert sorted(pos[v][1] for v in "abcde") == [0, 1, 2, 3, 4]
+    assert pos["A"] == (1, 2)
+
+
+def test_layout_two_column_array(twocomponents):
+    H = twocomponents.hypergraph
+    uids = [v.uid for v in H.nodes()] + [e.uid for e in H.edges()]
+    coords = layout_two_column_array(H)
+    assert coords.shape == (len(uids), 2)
+    assert dict(zip(uids, map(tuple, coords.tolist()))) == layout_two_column(H)
+
+
+def test_layout_two_column_invalid_ordering(twocomponents):
+    with pytest.raises(hnx.HyperNetXError):
+        layout_two_column(twocomponents.hypergraph, ordering="foo")
+
+
+def test_get_position_array(twocomponents):
+    H = twocomponents.hypergraph
+    uids = [v.uid for v in H.nodes()] + [e.uid for e in H.edges()]
+    pos = layout_two_column(H)
+    xy = get_position_array(pos, uids)
+    assert xy.shape == (len(uids), 2)
+    assert tuple(xy[uids.index("C")]) == pos["C"]
+    assert get_position_array(xy, uids) is xy
+    with pytest.raises(hnx.HyperNetXError):
+        get_position_array(xy[:-1], uids)
+
+
+def test_draw_hyper_edges(twocomponents):
+    H = twocomponents.hypergraph
+    pos = layout_two_column(H)
+    colors = {"A": "red", "B": "blue", "C": "green"}
+    fig, ax = plt.subplots()
+    lines = draw_hyper_edges(H, pos, ax=ax, colors=colors)
+    pairs = [(v, e.uid) for e in H.edges() for v in e]
+    segments = [path.vertices for path in lines.get_paths()]
+    assert np.allclose(segments, [(pos[v], pos[e]) for v, e in pairs])
+    assert np.allclose(lines.get_colors(), [to_rgba(colors[e]) for _, e in pairs])
+    plt.close(fig)
+
+
+def test_draw_colors(twocomponents):
+    H = twocomponents.hypergraph
+    fig, ax = plt.subplots()
+    draw(H, ax=ax)
+    fig.canvas.draw()
+    index = {e.uid: i for i, e in enumerate(H.edges())}
+    expected = [plt.cm.tab10(index[e.uid] % 10) for e in H.edges() for v in e]
+    assert np.allclose(ax.collections[0].get_colors(), expected)
+
+    edge_kwargs = {"colors": "black"}
+    fig, ax = plt.subplots()
+    draw(H, ax=ax, edge_kwargs=edge_kwargs)
+    assert edge_kwargs == {"colors": "black"}
+    assert np.allclose(ax.collections[0].get_colors(), [to_rgba("black")])
+    plt.close("all")
+
+
+def test_draw_hyper_edges_rasterized(twocomponents, monkeypatch):
+    H = twocomponents.hypergraph
+    pos = layout_two_column(H)
+    fig, ax = plt.subplots()
+    assert not draw_hyper_edges(H, pos, ax=ax).get_rasterized()
+    assert draw_hyper_edges(H, pos, ax=ax, rasterized=True).get_rasterized()
+    monkeypatch.setattr(two_column, "RASTERIZE_THRESHOLD", 5)
+    assert draw_hyper_edges(H, pos, ax=ax).get_rasterized()
+    plt.close(fig)
+
+
+def test_draw_hyper_labels_as_paths(twocomponents, monkeypatch):
+    H = twocomponents.hypergraph
+    pos = layout_two_column(H)
+    fig, ax = plt.subplots()
+    draw_hyper_labels(H, pos, ax=ax)
+    assert len(ax.texts) == 8 and len(ax.collections) == 0
+
+    monkeypatch.setattr(two_column, "TEXT_PATH_THRESHOLD", 5)
+    fig, ax = plt.subplots()
+    draw_hyper_labels(H, pos, ax=ax, labels={"C": ""})
+    assert len(ax.texts) == 0
+    nodes, edges = ax.collections
+    assert len(nodes.get_paths()) == 5 and len(edges.get_paths()) == 3
+    assert np.allclose(edges.get_offsets(), [pos[e] for e in "ABC"])
+    assert len(edges.get_paths()[2].vertices) == 0
+    plt.close("all")
+
+
+@pytest.mark.parametrize("as_paths", [False, True])
+def test_draw_hyper_labels_fontsize(twocomponents, as_paths):
+    H = twocomponents.hypergraph
+    pos = layout_two_column(H)
+    heights = []
+    for fontsize in [10, 20]:
+        fig, ax = plt.subplots()
+        draw_hyper_labels(H, pos, ax=ax, as_paths=as_paths, fontsize=fontsize)
+        if as_paths:
+            paths = ax.collections[0].get_paths()
+            heights.append(np.ptp(np.concatenate([p.vertices for p in paths])[:, 1]))
+        else:
+            assert {t.get_fontsize() for t in ax.texts} == {fontsize}
+            heights.append(fontsize)
+    assert np.isclose(heights[1], 2 * heights[0])
+    plt.close("all")
@@ -1,25 +1,176 @@
 # Copyright © 2018 Battelle Memorial Institute
 # All rights reserved.
 
+import warnings
+
 import matplotlib.pyplot as plt
-from matplotlib.collections import LineCollection
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.colors import NoNorm
+from matplotlib.path import Path
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextPath, text_to_path
+from matplotlib.transforms import IdentityTransform
+
+import numpy as np
+from scipy.sparse import bmat, csr_matrix, diags
+from scipy.sparse.csgraph import (
+    connected_components,
+    laplacian,
+    reverse_cuthill_mckee,
+)
+from scipy.sparse.linalg import eigsh, lobpcg
+
+from hypernetx.exception import HyperNetXError
+from .util import get_frozenset_label
 
-import networkx as nx
+# above this many vertices, the Fiedler vector is computed with LOBPCG
+LOBPCG_THRESHOLD = 500
 
-from .util import get_frozenset_label
+# above this many node-edge memberships, hyper edges are rasterized by default
+RASTERIZE_THRESHOLD = 5000
+
+# above this many labels, labels are drawn as a collection of paths by default
+TEXT_PATH_THRESHOLD = 1000
+
+
+def fiedler_ordering(A):
+    """
+    Spectral ordering of a connected graph.
+
+    The vertices are sorted by their value in the Fiedler vector (the
+    eigenvector of the second smallest eigenvalue of the graph Laplacian).
+    Small graphs use ARPACK in shift-invert mode. Above LOBPCG_THRESHOLD
+    vertices, factorizing the Laplacian gets expensive, so the Fiedler vector
+    is found with LOBPCG instead, orthogonal to the constant eigenvector and
+    with a Jacobi preconditioner, falling back to ARPACK if it does not
+    converge. Up to the sign of the Fiedler vector and ties, this gives the
+    same ordering as nx.spectral_ordering.
+
+    Parameters
+    ----------
+    A: scipy.sparse matrix
+        adjacency matrix of a connected graph with at least 3 vertices
+
+    Returns
+    -------
+    np.ndarray
+        the indices of the vertices in spectral order
+    """
+    n = A.shape[0]
+    L = laplacian(A.astype(np.float64))
+
+    # the starting vectors are fixed to make the layout deterministic
+    if n > LOBPCG_THRESHOLD:
+        X = np.random.default_rng(0).standard_normal((n, 1))
+        with warnings.catch_warnings():
+            # convergence is checked below instead
+            warnings.simplefilter("ignore", UserWarning)
+            vals, vecs = lobpcg(
+                L,
+                X,
+                M=diags(1 / L.diagonal()),
+                Y=np.ones((n, 1)),
+                largest=False,
+                tol=1e-8,
+                maxiter=200,
+            )
+        fiedler = vecs[:, 0]
+        # graphs with a tiny spectral gap, like long paths, may not converge
+        if np.linalg.norm(L @ fiedler - vals[0] * fiedler) < 1e-6:
+            return np.argsort(fiedler)
+
+    # the Laplacian is singular, so shift it to find the eigenvalues nearest 0;
+    # the algebraic connectivity is at least 4 / n**2, so this shift keeps the
+    # two smallest eigenvalues well apart after inversion
+    vals, vecs = eigsh(
+        L, k=2, sigma=-1 / n**2, which="LM", v0=np.arange(1, n + 1, dtype=float)
+    )
+    fiedler = vecs[:, np.argsort(vals)[1]]
+
+    return np.argsort(fiedler)
+
+
+def get_memberships(nodes, edges):
+    """
+    Helper function to index the node-edge memberships of a hypergraph
+
+    Parameters
+    ----------
+    nodes: list
+        the nodes of the hypergraph
+    edges: list
+        the edges of the hypergraph
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        for each membership, the index of its node in nodes and the index of
+        its edge in edges
+    """
+    index = {v.uid: i for i, v in enumerate(nodes)}
+    sizes = [len(e) for e in edges]
+
+    # the edge index only changes between edges, so it is repeated per edge
+    # rather than produced once per member
+    rows = np.fromiter(
+        (index[v] for e in edges for v in e), dtype=int, count=sum(sizes)
+    )
+    cols = np.repeat(np.arange(len(edges)), sizes)
+
+    return rows, cols
 
 
-def layout_two_column(H, spacing=2):
+def layout_two_column(H, spacing=2, ordering="spectral", nodes=None, edges=None):
     """
     Two column (bipartite) layout algorithm.
 
+    See layout_two_column_array for details, this function returns the same
+    positions as a dictionary.
+
+    Parameters
+    ----------
+    H: Hypergraph
+        the entity to be drawn
+    spacing: float
+        amount of whitespace between disconnected components
+    ordering: str
+        "spectral" or "rcm" (reverse Cuthill-McKee), the ordering used within
+        each connected component
+    nodes: list
+        precomputed list of the nodes of H; if None, H.nodes() is used
+    edges: list
+        precomputed list of the edges of H; if None, H.edges() is used
+
+    Returns
+    -------
+    dict
+        mapping of node and edge positions to R^2
+    """
+    nodes = list(H.nodes()) if nodes is None else nodes
+    edges = list(H.edges()) if edges is None else edges
+    uids = [v.uid for v in nodes] + [e.uid for e in edges]
+
+    coords = layout_two_column_array(
+        H, spacing=spacing, ordering=ordering, nodes=nodes, edges=edges
+    )
+
+    return dict(zip(uids, map(tuple, coords.tolist())))
+
+
+def layout_two_column_array(
+    H, spacing=2, ordering="spectral", nodes=None, edges=None, memberships=None
+):
+    """
+    Two column (bipartite) layout algorithm, computed as a position array.
+
     This algorithm first converts the hypergraph into a bipartite graph and
     then computes connected components. Disonneccted components are handled
     independently and then stacked together.
 
     Within a connected component, the spectral ordering of the bipartite graph
     provides a quick and dirty ordering that minimizes edge crossings in the
-    diagram.
+    diagram. For very large hypergraphs, the reverse Cuthill-McKee ordering is
+    cheaper to compute and gives a comparable reduction of long lines.
 
     Parameters
     ----------
@@ -27,34 +178,112 @@ def layout_two_column(H, spacing=2):
         the entity to be drawn
     spacing: float
         amount of whitespace between disconnected components
+    ordering: str
+        "spectral" or "rcm" (reverse Cuthill-McKee), the ordering used within
+        each connected component
+    nodes: list
+        precomputed list of the nodes of H; if None, H.nodes() is used
+    edges: list
+        precomputed list of the edges of H; if None, H.edges() is used
+    memberships: tuple
+        precomputed result of get_memberships(nodes, edges)
+
+    Returns
+    -------
+    np.ndarray
+        (N, 2) array of positions whose rows are the nodes followed by the
+        edges, in the order of nodes and edges; this can be passed as pos to
+        draw_hyper_edges and draw_hyper_labels
     """
-    offset = 0
-    pos = {}
+    if ordering not in {"spectral", "rcm"}:
+        raise HyperNetXError(f"ordering must be 'spectral' or 'rcm', not {ordering!r}")
 
-    def stack(vertices, x, height):
-        for i, v in enumerate(vertices):
-            pos[v] = (x, i + offset + (height - len(vertices)) / 2)
+    nodes = list(H.nodes()) if nodes is None else nodes
+    edges = list(H.edges()) if edges is None else edges
+    n = len(nodes)
 
-    G = H.bipartite()
-    for ci in nx.connected_components(G):
-        Gi = G.subgraph(ci)
-        key = {v: i for i, v in enumerate(nx.spectral_ordering(Gi))}.get
-        ci_vertices, ci_edges = [
-            sorted([v for v, d in Gi.nodes(data=True) if d["bipartite"] == j], key=key)
-            for j in [0, 1]
-        ]
+    # nodes are always in the left column and edges in the right column, so
+    # only the vertical position depends on the component
+    offset = 0
+    coords = np.zeros((n + len(edges), 2))
+    coords[n:, 0] = 1
+
+    def stack(vertices, height):
+        coords[vertices, 1] = (
+            np.arange(len(vertices)) + offset + (height - len(vertices)) / 2
+        )
+
+    # the bipartite graph is built directly as a sparse adjacency matrix from
+    # the node x edge incidence matrix; vertices are the nodes then the edges
+    rows, cols = memberships or get_memberships(nodes, edges)
+    B = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, len(edges)))
+    A = bmat([[None, B], [B.T, None]], format="csr")
+
+    is_edge = np.arange(len(coords)) >= n
+
+    # group the vertex indices by connected component, in order of appearance
+    n_components, labels = connected_components(A, directed=False)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.cumsum(np.bincount(labels, minlength=n_components))
+
+    for start, stop in zip(np.r_[0, bounds[:-1]], bounds):
+        idx = order[start:stop]
+        n_edges = np.count_nonzero(is_edge[idx])
+        # a component with a single node or a single edge is a star, for which
+        # any ordering is free of crossings
+        if min(n_edges, len(idx) - n_edges) <= 1:
+            ranked = idx
+        elif ordering == "rcm":
+            ranked = idx[reverse_cuthill_mckee(A[idx][:, idx], symmetric_mode=True)]
+        else:
+            ranked = idx[fiedler_ordering(A[idx][:, idx])]
+
+        # ranked is a permutation of the component, so splitting it by the
+        # mask yields the vertices and edges already in order
+        mask = is_edge[ranked]
+        ci_vertices = ranked[~mask]
+        ci_edges = ranked[mask]
 
         height = max(len(ci_vertices), len(ci_edges))
 
-        stack(ci_vertices, 0, height)
-        stack(ci_edges, 1, height)
+        stack(ci_vertices, height)
+        stack(ci_edges, height)
 
         offset += height + spacing
 
-    return pos
+    return coords
+
+
+def get_position_array(pos, uids):
+    """
+    Helper function to gather the positions of nodes and edges into an array
+
+    Parameters
+    ----------
+    pos: dict or np.ndarray
+        mapping of node and edge positions to R^2; arrays are returned as is,
+        and must have one row per uid
+    uids: list
+        the node and edge uids, in the order of the rows of the result
+
+    Returns
+    -------
+    np.ndarray
+        (N, 2) array where row i is the position of uids[i]
+    """
+    if isinstance(pos, np.ndarray):
+        if pos.shape != (len(uids), 2):
+            raise HyperNetXError(
+                f"position array has shape {pos.shape}, expected {(len(uids), 2)}"
+            )
+        return pos
+
+    return np.array([pos[uid] for uid in uids], dtype=float).reshape(-1, 2)
 
 
-def draw_hyper_edges(H, pos, ax=None, **kwargs):
+def draw_hyper_edges(
+    H, pos, ax=None, nodes=None, edges=None, memberships=None, rasterized=None, **kwargs
+):
     """
     Renders hyper edges for the two column layout.
 
@@ -65,10 +294,21 @@ def draw_hyper_edges(H, pos, ax=None, **kwargs):
     ----------
     H: Hypergraph
         the entity to be drawn
-    pos: dict
-        mapping of node and edge positions to R^2
+    pos: dict or np.ndarray
+        mapping of node and edge positions to R^2, or an array of positions
+        whose rows are the nodes of H followed by the edges of H
     ax: Axis
         matplotlib axis on which the plot is rendered
+    nodes: list
+        precomputed list of the nodes of H; if None, H.nodes() is used
+    edges: list
+        precomputed list of the edges of H; if None, H.edges() is used
+    memberships: tuple
+        precomputed result of get_memberships(nodes, edges)
+    rasterized: bool
+        True to render the lines as a bitmap in vector outputs; if None, the
+        lines are rasterized without antialiasing when there are more than
+        RASTERIZE_THRESHOLD memberships
     kwargs: dict
         keyword arguments passed to matplotlib.LineCollection
 
@@ -79,22 +319,94 @@ def draw_hyper_edges(H, pos, ax=None, **kwargs):
     """
     ax = ax or plt.gca()
 
-    pairs = [(v, e.uid) for e in H.edges() for v in e]
+    nodes = list(H.nodes()) if nodes is None else nodes
+    edges = list(H.edges()) if edges is None else edges
+    E = [e.uid for e in edges]
+
+    # gather positions into a contiguous array once, so that the segments can
+    # be built with a single vectorized lookup instead of per-pair dict access
+    pos_array = get_position_array(pos, [v.uid for v in nodes] + E)
+    rows, cols = memberships or get_memberships(nodes, edges)
+
+    def expand(values):
+        # look up each edge once, then gather the values for all memberships
+        per_edge = np.empty(len(E), dtype=object)
+        for j, e in enumerate(E):
+            per_edge[j] = values.get(e)
+        return np.take(per_edge, cols).tolist()
+
+    kwargs = {k: expand(v) if isinstance(v, dict) else v for k, v in kwargs.items()}
+
+    segments = np.stack([pos_array[rows], pos_array[cols + len(nodes)]], axis=1)
 
-    kwargs = {
-        k: v if type(v) != dict else [v.get(e) for _, e in pairs]
-        for k, v in kwargs.items()
-    }
+    lines = LineCollection(segments, **kwargs)
 
-    lines = LineCollection([(pos[u], pos[v]) for u, v in pairs], **kwargs)
+    if rasterized is None:
+        rasterized = len(segments) > RASTERIZE_THRESHOLD
+        if rasterized:
+            lines.set_antialiased(False)
+    lines.set_rasterized(rasterized)
 
     ax.add_collection(lines)
 
     return lines
 
 
+def get_text_paths(texts, ha, size=None):
+    """
+    Helper function to convert labels to outlines for a PathCollection
+
+    Each outline is measured in points and is aligned the same way as a text
+    artist with the given horizontal alignment and va="center".
+
+    Parameters
+    ----------
+    texts: list
+        the labels to be converted
+    ha: str
+        "left" or "right", the horizontal alignment of the labels
+    size: float
+        font size in points; if None, the matplotlib default is used
+
+    Returns
+    -------
+    list
+        a matplotlib Path for each label
+    """
+    prop = FontProperties(size=size)
+
+    # like text artists, labels are centered on the line height of the font
+    # rather than on their own glyphs, which also avoids computing the exact
+    # extents of every outline
+    _, height, descent = text_to_path.get_text_width_height_descent(
+        "lp", prop, ismath=False
+    )
+
+    paths = []
+    for text in map(str, texts):
+        # whitespace and empty labels have no outline to align
+        if not text.strip():
+            paths.append(Path(np.empty((0, 2))))
+            continue
+
+        path = TextPath((0, 0), text, prop=prop)
+        width = path.vertices[:, 0].max() if ha == "right" else 0
+        paths.append(Path(path.vertices - [width, height / 2 - descent], path.codes))
+
+    return paths
+
+
 def draw_hyper_labels(
-    H, pos, labels={}, with_node_labels=True, with_edge_labels=True, ax=None
+    H,
+    pos,
+    labels={},
+    with_node_labels=True,
+    with_edge_labels=True,
+    ax=None,
+    nodes=None,
+    edges=None,
+    as_paths=None,
+    fontsize=None,
 ):
     """
     Renders hyper labels (nodes and edges) for the two column layout.
@@ -103,8 +415,9 @@ def draw_hyper_labels(
     ----------
     H: Hypergraph
         the entity to be drawn
-    pos: dict
-        mapping of node and edge positions to R^2
+    pos: dict or np.ndarray
+        mapping of node and edge positions to R^2, or an array of positions
+        whose rows are the nodes of H followed by the edges of H
     labels: dict
         custom labels for nodes and edges can be supplied
     with_node_labels: bool
@@ -113,25 +426,59 @@ def draw_hyper_labels(
         False to disable edge labels
     ax: Axis
         matplotlib axis on which the plot is rendered
-    kwargs: dict
-        keyword arguments passed to matplotlib.LineCollection
+    nodes: list
+        precomputed list of the nodes of H; if None, H.nodes() is used
+    edges: list
+        precomputed list of the edges of H; if None, H.edges() is used
+    as_paths: bool
+        True to render the labels as a single collection of text outlines
+        instead of one text artist per label; if None, paths are used when
+        there are more than TEXT_PATH_THRESHOLD labels
+    fontsize: float
+        font size of the labels in points; if None, the matplotlib default is
+        used
 
     """
 
     ax = ax or plt.gca()
 
-    edges = [e.uid for e in H.edges()]
+    V = [v.uid for v in (H.nodes() if nodes is None else nodes)]
+    E = [e.uid for e in (H.edges() if edges is None else edges)]
+
+    pos_array = get_position_array(pos, V + E)
 
     to_draw = []
     if with_node_labels:
-        to_draw.append((H.nodes(), "right"))
+        to_draw.append((V, pos_array[: len(V)], "right"))
 
     if with_edge_labels:
-        to_draw.append((H.edges(), "left"))
-
-    for points, ha in to_draw:
-        for p in points:
-            ax.annotate(labels.get(p.uid, p.uid), pos[p.uid], ha=ha, va="center")
+        to_draw.append((E, pos_array[len(V) :], "left"))
+
+    if as_paths is None:
+        as_paths = sum(len(uids) for uids, _, _ in to_draw) > TEXT_PATH_THRESHOLD
+
+    if as_paths:
+        for uids, xy, ha in to_draw:
+            texts = [labels.get(uid, uid) for uid in uids]
+            ax.add_collection(
+                PathCollection(
+                    get_text_paths(texts, ha, size=fontsize),
+                    sizes=[1],
+                    offsets=xy,
+                    offset_transform=ax.transData,
+                    transform=IdentityTransform(),
+                    facecolors=plt.rcParams["text.color"],
+                    edgecolors="none",
+                    clip_on=False,
+                )
+            )
+        return
+
+    # text artists are much lighter than annotations, which carry arrow and
+    # coordinate system machinery that is not needed here
+    for uids, xy, ha in to_draw:
+        for uid, (x, y) in zip(uids, xy.tolist()):
+            ax.text(x, y, labels.get(uid, uid), ha=ha, va="center", fontsize=fontsize)
 
 
 def draw(
@@ -143,6 +490,7 @@ def draw(
     with_color=True,
     edge_kwargs=None,
     ax=None,
+    layout_kwargs=None,
 ):
     """
     Draw a hypergraph using a two-collumn layout.
@@ -170,32 +518,59 @@ def draw(
     with_edge_counts: bool
         set to True to label collapsed edges with number of elements
     with_color: bool
-        set to False to disable color cycling of hyper edges
+        set to False to disable color cycling of hyper edges; color cycling is
+        also skipped if edge_kwargs specifies colors
     edge_kwargs: dict
         keyword arguments to pass to matplotlib.LineCollection
     ax: Axis
         matplotlib axis on which the plot is rendered
+    layout_kwargs: dict
+        keyword arguments passed to layout_two_column_array, e.g., spacing,
+        ordering
     """
 
-    edge_kwargs = edge_kwargs or {}
+    edge_kwargs = dict(edge_kwargs or {})
+    layout_kwargs = layout_kwargs or {}
 
     ax = ax or plt.gca()
 
-    pos = layout_two_column(H)
+    # H.nodes() and H.edges() are generators, materialize them once and share
+    # the result with the rendering functions below
+    nodes = list(H.nodes())
+    edges = list(H.edges())
 
-    V = [v.uid for v in H.nodes()]
-    E = [e.uid for e in H.edges()]
+    V = [v.uid for v in nodes]
+    E = [e.uid for e in edges]
 
-    labels = {}
-    labels.update(get_frozenset_label(V, count=with_node_counts))
-    labels.update(get_frozenset_label(E, count=with_edge_counts))
+    # likewise, the node-edge memberships are indexed once for the layout and
+    # the hyper edges
+    memberships = get_memberships(nodes, edges)
 
-    if with_color:
-        edge_kwargs["color"] = {
-            e.uid: plt.cm.tab10(i % 10) for i, e in enumerate(H.edges())
-        }
+    pos = layout_two_column_array(
+        H, nodes=nodes, edges=edges, memberships=memberships, **layout_kwargs
+    )
 
-    draw_hyper_edges(H, pos, ax=ax, **edge_kwargs)
+    # only collapsed nodes and edges have labels other than their uid, which
+    # the text artists convert to a string anyway
+    labels = {}
+    if with_node_labels:
+        collapsed = [v for v in V if type(v) == frozenset]
+        labels.update(get_frozenset_label(collapsed, count=with_node_counts))
+    if with_edge_labels:
+        collapsed = [e for e in E if type(e) == frozenset]
+        labels.update(get_frozenset_label(collapsed, count=with_edge_counts))
+
+    color_keys = {"color", "colors", "edgecolor", "edgecolors", "array"}
+    if with_color and not color_keys.intersection(edge_kwargs):
+        # color each membership by the index of its edge, the mapping through
+        # the colormap is done by matplotlib rather than with a per-edge dict
+        edge_kwargs["array"] = memberships[1] % 10
+        edge_kwargs["cmap"] = plt.cm.tab10
+        edge_kwargs["norm"] = NoNorm()
+
+    draw_hyper_edges(
+        H, pos, ax=ax, nodes=nodes, edges=edges, memberships=memberships, **edge_kwargs
+    )
     draw_hyper_labels(
         H,
         pos,
@@ -203,6 +578,8 @@ def draw(
         ax=ax,
         with_node_labels=with_node_labels,
         with_edge_labels=with_edge_labels,
+        nodes=nodes,
+        edges=edges,
     )
     ax.autoscale_view()
 
@@ -26,7 +26,7 @@ setup(
         "networkx>=2.2,<3.0",
         "numpy>=1.15.0,<2.0",
         "scipy>=1.1.0,<2.0",
-        "matplotlib>3.0",
+        "matplotlib>=3.6",
         "scikit-learn>=0.20.0",
         "pandas>=0.23",
     ],